@@ -5,9 +5,54 @@ import tempfile
 import tarfile
 import zipfile
 import shutil
+import subprocess
 from pathlib import Path
 from pydantic import BaseModel
-from typing import Any, Dict, Union, List
+from typing import Any, Dict, Union, List, Optional
+
+# Prefer orjson for (de)serialisation when available, falling back to stdlib json.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so error handling is shared.
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+
+# Optional parallel gzip decompressor for large layers
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+# Resolved handler classes keyed by handler path, reused across warm invocations
+_handler_cache: Dict[str, Any] = {}
+
+# Layer directories already extracted and directories known to be on PATH
+_extracted_layers: set = set()
+_path_entries: set = set()
+_path_snapshot: Optional[str] = None
+
+# tarfile's safe extraction filter, only present on patched Python releases
+_data_filter = getattr(tarfile, "data_filter", None)
+
+# Read/copy buffer for layer extraction
+_EXTRACT_BUFFER_SIZE = 1024 * 1024
+
+# Gzip layers at least this large are decompressed in parallel when possible
+_PARALLEL_GZIP_THRESHOLD = 64 * 1024 * 1024
+
+# Static response headers shared by every invocation
+_ERROR_HEADERS = {"Content-Type": "application/json"}
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Credentials": "true",
+}
+_JSON_HEADERS = {**_ERROR_HEADERS, **_CORS_HEADERS}
 
 
 class HandlerInput(BaseModel):
@@ -21,9 +66,148 @@ class HandlerInput(BaseModel):
 
 def add_to_path(directory: str):
     """Add directory to PATH environment variable."""
-    current_path = os.environ.get("PATH", "")
-    if directory not in current_path:
-        os.environ["PATH"] = f"{directory}:{current_path}"
+    global _path_snapshot
+
+    # The entries are re-read only when PATH changed since they were last seen,
+    # so edits made elsewhere are picked up and unchanged PATHs are set lookups
+    path = os.environ.get("PATH", "")
+    if path != _path_snapshot:
+        _path_entries.clear()
+        _path_entries.update(path.split(os.pathsep))
+        _path_snapshot = path
+
+    if directory in _path_entries:
+        return
+
+    path = f"{directory}{os.pathsep}{path}" if path else directory
+    os.environ["PATH"] = path
+    _path_entries.add(directory)
+    _path_snapshot = path
+
+
+def strip_first_component(
+    member: tarfile.TarInfo, dest_path: str
+) -> Union[tarfile.TarInfo, None]:
+    """tarfile extraction filter equivalent to tar's --strip-components=1.
+
+    The stripped member is then passed through tarfile's data filter, which
+    rejects absolute paths and links that escape the destination.
+    """
+    _, _, stripped = member.name.partition("/")
+    if not stripped:  # Only extract if there's a path left
+        return None
+    if member.islnk():
+        # Hard link targets are archive paths, so they lose the same component
+        _, _, link_target = member.linkname.partition("/")
+        if not link_target:
+            return None
+        member = member.replace(name=stripped, linkname=link_target, deep=False)
+    else:
+        member = member.replace(name=stripped, deep=False)
+    if _data_filter is not None:
+        member = _data_filter(member, dest_path)
+    return member
+
+
+def _extract_stripped(tar: tarfile.TarFile, layer_dir: str):
+    """Extract all members with strip_first_component.
+
+    extractall creates directories as 0o700 and applies their archived modes
+    only after the last member, so they are restored here if extraction fails.
+    """
+    if _data_filter is None:
+        # extractall has no filter argument before 3.10.12 and 3.11.4
+        for member in tar:
+            member = strip_first_component(member, layer_dir)
+            if member is not None:
+                tar.extract(member, layer_dir)
+        return
+
+    directories = []
+
+    def layer_filter(member: tarfile.TarInfo, dest_path: str):
+        member = strip_first_component(member, dest_path)
+        if member is not None and member.isdir():
+            directories.append(member)
+        return member
+
+    extracted = False
+    try:
+        tar.extractall(layer_dir, filter=layer_filter)
+        extracted = True
+    finally:
+        if not extracted:
+            for member in directories:
+                if member.mode is None:
+                    continue
+                try:
+                    os.chmod(os.path.join(layer_dir, member.name), member.mode)
+                except OSError:
+                    pass
+
+
+def extract_tar_layer(layer_file_path: str, layer_dir: str):
+    """Extract a tar layer into layer_dir, stripping the first path component.
+
+    Large gzip layers are inflated with rapidgzip or pigz when available, since
+    single-threaded gzip inflation dominates extraction time for them.
+    """
+    if (
+        layer_file_path.endswith((".tar.gz", ".tgz"))
+        and os.path.getsize(layer_file_path) >= _PARALLEL_GZIP_THRESHOLD
+    ):
+        if rapidgzip is not None:
+            with rapidgzip.open(
+                layer_file_path, parallelization=os.cpu_count()
+            ) as gz, tarfile.open(
+                fileobj=gz, mode="r|", bufsize=_EXTRACT_BUFFER_SIZE
+            ) as tar:
+                _extract_stripped(tar, layer_dir)
+            return
+
+        pigz = shutil.which("pigz")
+        if pigz:
+            with subprocess.Popen(
+                [pigz, "-dc", layer_file_path], stdout=subprocess.PIPE
+            ) as proc, tarfile.open(
+                fileobj=proc.stdout, mode="r|", bufsize=_EXTRACT_BUFFER_SIZE
+            ) as tar:
+                _extract_stripped(tar, layer_dir)
+            if proc.returncode:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args)
+            return
+
+    # Stream the archive sequentially, no up-front member table scan
+    with tarfile.open(layer_file_path, "r|*", bufsize=_EXTRACT_BUFFER_SIZE) as tar:
+        _extract_stripped(tar, layer_dir)
+
+
+def extract_zip_layer(layer_file_path: str, layer_dir: str):
+    """Extract a zip layer into layer_dir, stripping the first path component."""
+    with zipfile.ZipFile(layer_file_path, "r") as zip_file:
+        directories = set()
+        files = []
+        # ZipInfo objects are already parsed; opening by info skips the name lookup
+        for info in zip_file.infolist():
+            # Skip the first path component (equivalent to strip=1)
+            _, _, new_path = info.filename.partition("/")
+            if not new_path:  # Only extract if there's a path left
+                continue
+
+            target_path = os.path.join(layer_dir, new_path)
+            if info.is_dir():
+                directories.add(target_path)
+            else:
+                directories.add(os.path.dirname(target_path))
+                files.append((info, target_path))
+
+        # Create each distinct directory once instead of once per file
+        for directory in sorted(directories):
+            os.makedirs(directory, exist_ok=True)
+
+        for info, target_path in files:
+            with zip_file.open(info) as source, open(target_path, "wb") as target:
+                shutil.copyfileobj(source, target, _EXTRACT_BUFFER_SIZE)
 
 
 def add_layer_to_path(layer: Dict[str, Any]) -> str:
@@ -40,11 +224,11 @@ def add_layer_to_path(layer: Dict[str, Any]) -> str:
     ).stem  # Remove extension, equivalent to parse(layer.name).name
     layer_dir = os.path.join(tmp_dir, "layers", layer_base)
 
-    if not os.path.exists(layer_dir):
-        # Remove existing directory if it exists
-        if os.path.exists(layer_dir):
-            shutil.rmtree(layer_dir)
+    # Already extracted by this process, nothing left to do
+    if layer_dir in _extracted_layers:
+        return layer_dir
 
+    if not os.path.exists(layer_dir):
         # Create directory structure
         os.makedirs(layer_dir, exist_ok=True)
 
@@ -54,47 +238,42 @@ def add_layer_to_path(layer: Dict[str, Any]) -> str:
         try:
             # Try tar extraction first (most common for layers)
             if layer_name.endswith((".tar.gz", ".tgz", ".tar")):
-                with tarfile.open(layer_file_path, "r:*") as tar:
-                    # Extract with strip=1 equivalent (remove first path component)
-                    members = tar.getmembers()
-                    for member in members:
-                        # Skip the first path component (equivalent to strip=1)
-                        path_parts = member.name.split("/")
-                        if len(path_parts) > 1:
-                            member.name = "/".join(path_parts[1:])
-                            if member.name:  # Only extract if there's a path left
-                                tar.extract(member, layer_dir)
+                # Extract with strip=1 equivalent (remove first path component)
+                extract_tar_layer(layer_file_path, layer_dir)
 
             # Try zip extraction
             elif layer_name.endswith(".zip"):
-                with zipfile.ZipFile(layer_file_path, "r") as zip_file:
-                    for member in zip_file.namelist():
-                        # Skip the first path component (equivalent to strip=1)
-                        path_parts = member.split("/")
-                        if len(path_parts) > 1:
-                            new_path = "/".join(path_parts[1:])
-                            if new_path:  # Only extract if there's a path left
-                                # Extract to new path
-                                source = zip_file.open(member)
-                                target_path = os.path.join(layer_dir, new_path)
-                                os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                                with open(target_path, "wb") as target:
-                                    shutil.copyfileobj(source, target)
-                                source.close()
+                # Extract with strip=1 equivalent (remove first path component)
+                extract_zip_layer(layer_file_path, layer_dir)
 
             else:
                 # Fallback: just copy the file
                 shutil.copy2(layer_file_path, layer_dir)
 
         except Exception as e:
-            pass
-            # Continue anyway, directory might still be useful
+            # Drop the partial extraction so a later call tries again
+            shutil.rmtree(layer_dir, ignore_errors=True)
+            return layer_dir
 
     add_to_path(layer_dir)
+    _extracted_layers.add(layer_dir)
     return layer_dir
 
 
-def safe_json_parse(json_string: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+def resolve_handler(handler_path: str) -> Any:
+    """Import and cache the handler class exported by app.handlers.<handler_path>."""
+    handler_class = _handler_cache.get(handler_path)
+    if handler_class is None:
+        handler_module = importlib.import_module(f"app.handlers.{handler_path}")
+        handler_class = _handler_cache.setdefault(
+            handler_path, getattr(handler_module, handler_path)
+        )
+    return handler_class
+
+
+def safe_json_parse(
+    json_string: Union[str, bytes, Dict[str, Any], None],
+) -> Dict[str, Any]:
     """Safe JSON parser helper."""
     if not json_string:
         return {}
@@ -104,18 +283,18 @@ def safe_json_parse(json_string: Union[str, Dict[str, Any], None]) -> Dict[str,
         return json_string
 
     try:
-        return json.loads(json_string)
-    except (json.JSONDecodeError, TypeError) as error:
+        return _loads(json_string)
+    except (json.JSONDecodeError, UnicodeDecodeError, TypeError) as error:
         return {}
 
 
 def extract_unified_params(req) -> Dict[str, Any]:
     """Extract and combine all parameters from Azure Function event."""
-    raw_body = req.get_body()
-    body = req.get_body().decode() if req.get_body() else ""
-    query_params = dict(req.params)  # req.params is for query parameters
-    body_params = safe_json_parse(raw_body or body)
-    route_params = dict(req.route_params)  # req.route_params is for route parameters
+    # The JSON parser accepts bytes directly, so the body is never decoded separately.
+    # req.get_json() is not used: it decodes to str and parses with stdlib json.
+    body_params = safe_json_parse(req.get_body())
+    query_params = req.params  # req.params is for query parameters
+    route_params = req.route_params  # req.route_params is for route parameters
 
     # Merge all parameters with body taking lowest precedence
     # Order: routeParams override queryParams override bodyParams
@@ -127,20 +306,30 @@ def extract_unified_params(req) -> Dict[str, Any]:
     )
 
 
+def json_response(body: Any, status_code: int = 200, headers: Dict[str, str] = None):
+    """Build a JSON Azure Function HttpResponse."""
+    import azure.functions as func
+
+    return func.HttpResponse(
+        body=_dumps(body),
+        status_code=status_code,
+        headers=_JSON_HEADERS if headers is None else headers,
+        mimetype="application/json",
+    )
+
+
 def handler_azure_function_wrapper(
     handler_path: str, layers: List[Dict[str, Any]] = []
 ):
     """Azure Function wrapper that calls shiv executable instead of importing module."""
 
+    # Extract layers once per process instead of on every invocation
+    for layer in layers:
+        add_layer_to_path(layer)
+
     async def main(req, res):
         """Azure Function entry point."""
-        import azure.functions as func
-
-        for layer in layers:
-            add_layer_to_path(layer)
-
-        handler_module = importlib.import_module(f"app.handlers.{handler_path}")
-        handler_class = getattr(handler_module, handler_path)
+        handler_class = resolve_handler(handler_path)
         try:
             # Extract and unify all parameters
             unified_params = extract_unified_params(req)
@@ -159,61 +348,33 @@ def handler_azure_function_wrapper(
             result = await handler_class.execute(unified_params, azure_context)
 
             # Convert result to Azure Function response and set on res binding
-            if result and isinstance(result, dict):
-                if "success" in result:
-                    if result["success"]:
-                        response = func.HttpResponse(
-                            body=json.dumps(result.get("data", {})),
-                            status_code=result.get("statusCode", 200),
-                            headers={
-                                "Content-Type": "application/json",
-                                **result.get("headers", {}),
-                                "Access-Control-Allow-Origin": "*",
-                                "Access-Control-Allow-Credentials": "true",
-                            },
-                            mimetype="application/json",
-                        )
-                    else:
-                        response = func.HttpResponse(
-                            body=json.dumps({"error": result.get("error", {})}),
-                            status_code=500,
-                            headers={"Content-Type": "application/json"},
-                            mimetype="application/json",
-                        )
+            if result and isinstance(result, dict) and "success" in result:
+                if result["success"]:
+                    # Custom headers may override Content-Type but never CORS
+                    custom_headers = result.get("headers")
+                    response = json_response(
+                        result.get("data", {}),
+                        result.get("statusCode", 200),
+                        (
+                            {**_ERROR_HEADERS, **custom_headers, **_CORS_HEADERS}
+                            if custom_headers
+                            else _JSON_HEADERS
+                        ),
+                    )
                 else:
-                    response = func.HttpResponse(
-                        body=json.dumps(result),
-                        status_code=200,
-                        headers={
-                            "Content-Type": "application/json",
-                            "Access-Control-Allow-Origin": "*",
-                            "Access-Control-Allow-Credentials": "true",
-                        },
-                        mimetype="application/json",
+                    response = json_response(
+                        {"error": result.get("error", {})}, 500, _ERROR_HEADERS
                     )
             else:
-                response = func.HttpResponse(
-                    body=json.dumps(result if result is not None else {}),
-                    status_code=200,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Access-Control-Allow-Origin": "*",
-                        "Access-Control-Allow-Credentials": "true",
-                    },
-                    mimetype="application/json",
-                )
+                response = json_response(result if result is not None else {})
 
             # Set the response on the output binding
             res.set(response)
 
         except Exception as error:
-            error_response = func.HttpResponse(
-                body=json.dumps({"error": {"message": str(error)}}),
-                status_code=500,
-                headers={"Content-Type": "application/json"},
-                mimetype="application/json",
+            res.set(
+                json_response({"error": {"message": str(error)}}, 500, _ERROR_HEADERS)
             )
-            res.set(error_response)
 
     return main
 
@@ -4,6 +4,7 @@ This module provides the main RPC handler that mirrors the TypeScript implementa
 handling JSON-RPC requests and routing them appropriately.
 """
 
+import os
 from typing import Any, Dict, Optional
 from pydantic import ValidationError
 
@@ -15,18 +16,20 @@ from app.helpers.mcp_caller import McpCaller
 from app.helpers.uv_handler import parse_mcp_server_params
 from app.handlers.helpers import HandlerInput, RuntimeContext, get_trace_id
 
-# import common and heavy dependencies for keeping runtime fast
-import pandas
-import requests
-import numpy
-import matplotlib.pyplot
-import time
+# Optionally pre-import common heavy dependencies so MCP servers using them start
+# warm. Opt-in only, since these imports add seconds to every cold start.
+if os.environ.get("PREIMPORT_HEAVY"):
+    import pandas
+    import requests
+    import numpy
+    import matplotlib.pyplot
 
-# Concurrency lock to ensure only one RPC call is processed at a time on this machine
+# Concurrency lock to ensure only one MCP server runs at a time on this machine
 import asyncio
 
-# Module-level asyncio lock used to serialise access to the rpc_handler
-_rpc_lock = asyncio.Lock()
+# Module-level asyncio lock serialising MCP server calls. Threaded MCP servers
+# swap the process-wide sys.stdin/sys.stdout, so two servers cannot run at once.
+_mcp_lock = asyncio.Lock()
 
 
 def generate_jsonrpc_response(
@@ -34,74 +37,54 @@ def generate_jsonrpc_response(
     tracer: Optional[Tracer] = None,
     result: Optional[Dict[str, Any]] = None,
     error: Optional[Dict[str, Any]] = None,
+    server_config: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    """Generate JSON-RPC response that mirrors the TypeScript generateJSONRPCResponse function."""
+    """Generate JSON-RPC response that mirrors the TypeScript generateJSONRPCResponse function.
 
-    # Parse _meta from data params
-    parsed_success = False
-    server_config = None
+    Pass an already dumped ``server_config`` to skip re-parsing ``_meta`` from data.
+    """
 
-    try:
-        if data and data.get("params") and data["params"].get("_meta"):
-            meta = CustomRequestMeta(**data["params"]["_meta"])
-            parsed_success = True
-            server_config = meta.server.model_dump()
-    except (ValidationError, TypeError, KeyError):
-        pass
+    # Parse _meta from data params unless the caller already did
+    if server_config is None:
+        try:
+            if data and data.get("params") and data["params"].get("_meta"):
+                meta = CustomRequestMeta(**data["params"]["_meta"])
+                server_config = meta.server.model_dump()
+        except (ValidationError, TypeError, KeyError):
+            pass
 
     # Build custom metadata
     custom_metadata = {}
-    if parsed_success and server_config:
+    if server_config:
         custom_metadata["server"] = server_config
     if tracer:
         custom_metadata["trace"] = tracer.get_trace(error is None)
 
-    # Handle error response
-    if error:
-        response = {
-            "jsonrpc": data.get("jsonrpc", "2.0") if data else "2.0",
-            "error": {
-                **error,
-                "data": {
-                    **(
-                        error.get("data", {})
-                        if isinstance(error.get("data"), dict)
-                        else {}
-                    ),
-                    "_meta": {
-                        **custom_metadata,
-                        **(
-                            error.get("data", {}).get("_meta", {})
-                            if isinstance(error.get("data"), dict)
-                            and isinstance(error.get("data", {}).get("_meta"), dict)
-                            else {}
-                        ),
-                    },
-                },
-            },
-        }
-
-        # Add id if present in request data
-        if data and "id" in data:
-            response["id"] = data["id"]
+    response = {"jsonrpc": data.get("jsonrpc", "2.0") if data else "2.0"}
 
-        return response
-
-    # Handle success response
-    response = {
-        "jsonrpc": data.get("jsonrpc", "2.0") if data else "2.0",
-        "result": {
-            **(result or {}),
-            "_meta": {
-                **(
-                    result.get("_meta", {})
-                    if result and isinstance(result.get("_meta"), dict)
-                    else {}
-                ),
-                **custom_metadata,
-            },
-        },
-    }
+    # Handle error response: error's own _meta takes precedence over ours
+    if error:
+        err_data = error.get("data")
+        err_data = dict(err_data) if isinstance(err_data, dict) else {}
+        err_meta = err_data.get("_meta")
+
+        meta = dict(custom_metadata)
+        if isinstance(err_meta, dict):
+            meta.update(err_meta)
+        err_data["_meta"] = meta
+
+        response_error = dict(error)
+        response_error["data"] = err_data
+        response["error"] = response_error
+    # Handle success response: our metadata takes precedence over result's _meta
+    else:
+        response_result = dict(result) if result else {}
+        result_meta = response_result.get("_meta")
+
+        meta = dict(result_meta) if isinstance(result_meta, dict) else {}
+        meta.update(custom_metadata)
+        response_result["_meta"] = meta
+        response["result"] = response_result
 
     # Add id if present in request data
     if data and "id" in data:
@@ -138,17 +121,28 @@ handlers_map = {
     "roots/list": False,
 }
 
+# Dispatch tables derived from handlers_map: outlet-level callables and the
+# methods forwarded to the MCP server
+_OUTLET_HANDLERS = {
+    key: value for key, value in handlers_map.items() if callable(value)
+}
+_MCP_METHODS = frozenset(key for key, value in handlers_map.items() if value is True)
+
+# Supported methods and the error message listing them (in handlers_map order)
+_SUPPORTED_METHODS = frozenset(_OUTLET_HANDLERS) | _MCP_METHODS
+_SUPPORTED_METHODS_MSG = "Rpc supporting only {} methods".format(
+    ", ".join(key for key in handlers_map if key in _SUPPORTED_METHODS)
+)
+
 
 async def rpc_handler(
     handler_input: HandlerInput, context: RuntimeContext
 ) -> Dict[str, Any]:
     """RPC handler that mirrors the TypeScript rpc handler."""
 
-    # Ensure single-threaded execution by acquiring the global lock
-    await _rpc_lock.acquire()
-
     tracer = Tracer(get_trace_id(handler_input.data, "id"))
-    mcp_caller = None
+    server_config = None
+    request_data = None
 
     try:
         # AWS-specific handling
@@ -173,6 +167,7 @@ async def rpc_handler(
                 )
 
             meta_params = CustomRequestMeta(**request_data["params"]["_meta"])
+            server_config = meta_params.server.model_dump()
         except ValidationError as e:
             raise CustomError(
                 CustomErrorCode.INVALID_REQUEST,
@@ -182,48 +177,35 @@ async def rpc_handler(
 
         # Get method and check if it's supported
         method = request_data.get("method", "")
-        handler = handlers_map.get(method)
-
-        if handler is None:
-            supported_methods = [
-                key for key, value in handlers_map.items() if value is not False
-            ]
-            raise CustomError(
-                CustomErrorCode.METHOD_NOT_FOUND,
-                f"Rpc supporting only {', '.join(supported_methods)} methods",
-            )
 
         # Handle outlet-level methods (functions)
-        if callable(handler):
+        outlet_handler = _OUTLET_HANDLERS.get(method)
+        if outlet_handler is not None:
             tracer.record_span("outletHandler")
-            result = handler(request_data, context)
-            return generate_jsonrpc_response(request_data, tracer, result.get("result"))
-
-        # Handle unsupported methods
-        if handler is False:
-            supported_methods = [
-                key for key, value in handlers_map.items() if value is not False
-            ]
+            result = outlet_handler(request_data, context)
+            return generate_jsonrpc_response(
+                request_data, tracer, result.get("result"), server_config=server_config
+            )
+
+        # Handle unknown and unsupported methods
+        if method not in _MCP_METHODS:
+            raise CustomError(CustomErrorCode.METHOD_NOT_FOUND, _SUPPORTED_METHODS_MSG)
+
+        # Handle MCP server-level methods, notifications can't work with server handler
+        if "id" not in request_data:
             raise CustomError(
-                CustomErrorCode.METHOD_NOT_FOUND,
-                f"Rpc supporting only {', '.join(supported_methods)} methods",
+                CustomErrorCode.METHOD_NOT_FOUND, f"Method not found: {method}"
+            )
+        tracer.record_span("extractingServerConfig")
+        if not meta_params.server.command.startswith("uv"):
+            raise CustomError(
+                CustomErrorCode.INVALID_REQUEST,
+                "Only uv or uvx command is supported for now",
             )
 
-        # Handle MCP server-level methods (handler is True)
-        if handler is True:
-            # For notifications, can't work with server handler
-            if "id" not in request_data:
-                raise CustomError(
-                    CustomErrorCode.METHOD_NOT_FOUND, f"Method not found: {method}"
-                )
-            tracer.record_span("extractingServerConfig")
-            if meta_params.server.command.startswith("uv"):
-                uv_params = parse_mcp_server_params(meta_params.server.args)
-            else:
-                raise CustomError(
-                    CustomErrorCode.INVALID_REQUEST,
-                    "Only uv or uvx command is supported for now",
-                )
+        # Only the install and MCP server round-trip need exclusive access
+        async with _mcp_lock:
+            uv_params = parse_mcp_server_params(meta_params.server.args)
             tracer.record_span("connectToServer")
             mcp_caller = McpCaller(
                 McpCallerConfiguration(
@@ -236,43 +218,44 @@ async def rpc_handler(
                     function_name=uv_params.get("function_name"),
                 )
             )
-            await mcp_caller.connect()
+            try:
+                await mcp_caller.connect()
 
-            tracer.record_span("executeMcpCall", None, {"method": method})
-            result = await mcp_caller.execute_mcp_call(request_data, tracer)
+                tracer.record_span("executeMcpCall", None, {"method": method})
+                result = await mcp_caller.execute_mcp_call(request_data, tracer)
+            finally:
+                await mcp_caller.close()
 
-            # Return the result from MCP call directly
-            return generate_jsonrpc_response(request_data, tracer, result)
+        # Return the result from MCP call directly
+        return generate_jsonrpc_response(
+            request_data, tracer, result, server_config=server_config
+        )
 
     except CustomError as e:
         return generate_jsonrpc_response(
             (
                 request_data
-                if "request_data" in locals()
+                if request_data is not None
                 else handler_input.data.get("data") if handler_input.data else None
             ),
             tracer,
             None,
             e.to_response(),
+            server_config,
         )
     except Exception as e:
         formatted_error = format_error(e)
         return generate_jsonrpc_response(
             (
                 request_data
-                if "request_data" in locals()
+                if request_data is not None
                 else handler_input.data.get("data") if handler_input.data else None
             ),
             tracer,
             None,
             formatted_error.to_response(),
+            server_config,
         )
-    finally:
-        # Always release the lock and close the MCP caller if needed
-        if mcp_caller:
-            await mcp_caller.close()
-
-        _rpc_lock.release()
 
 
 class RPCHandler:
@@ -4,12 +4,13 @@ This module provides custom error classes that mirror the TypeScript implementat
 to ensure consistent error handling and response formatting.
 """
 
+from enum import IntEnum
 from typing import Dict, Any, Optional
 from app.helpers.schema import CustomErrorResponse
 
 
 # Mirror TypeScript ErrorCode enum
-class CustomErrorCode:
+class CustomErrorCode(IntEnum):
     """Error codes matching the MCP SDK ErrorCode enum."""
 
     # Standard JSON-RPC error codes
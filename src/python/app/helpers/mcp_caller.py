@@ -5,48 +5,97 @@ calls against MCP servers using a simple threading approach.
 """
 
 import asyncio
+import concurrent.futures
+import functools
+import inspect
 import json
 import threading
+import traceback
 import importlib
 import sys
 import os
-from io import StringIO
-from typing import Any, Dict, List, Optional, Union
+from io import StringIO, TextIOBase
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+# Prefer orjson for JSON-RPC framing when available, falling back to stdlib json.
+# Both variants produce bytes and parse bytes or str directly.
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+# uvloop gives the server-side event loops faster primitives when installed
+try:
+    import uvloop
+
+    _new_event_loop = uvloop.new_event_loop
+except ImportError:
+    _new_event_loop = asyncio.new_event_loop
 
 # Absolute imports from python package
 from app.helpers.error import CustomError, CustomErrorCode, format_error
 from app.helpers.schema import McpCallerConfiguration
 from app.helpers.tracer import Tracer
 
+# Newline delimiter shared by every gather-write of a JSON-RPC message
+_NL = b"\n"
+
+# Most buffers a single writev accepts
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):
+    _IOV_MAX = 1024
+
+# JSON scalars returned as-is by _convert_to_dict
+_JSON_SCALARS = (str, int, float, bool)
+
+
+class _DiscardOutput(TextIOBase):
+    """Text stream that drops writes, used when tool output is not traced."""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+_DISCARD_OUTPUT = _DiscardOutput()
+
 
 def _convert_to_dict(obj: Any) -> Any:
     """Convert objects to JSON-serializable dictionaries."""
-    if obj is None:
-        return None
-    elif isinstance(obj, (str, int, float, bool)):
+    if obj is None or isinstance(obj, _JSON_SCALARS):
         return obj
-    elif isinstance(obj, (list, tuple)):
-        return [_convert_to_dict(item) for item in obj]
     elif isinstance(obj, dict):
         # Skip None values to match TypeScript behavior
-        result = {}
-        for key, value in obj.items():
-            converted_value = _convert_to_dict(value)
-            if converted_value is not None:
-                result[key] = converted_value
-        return result
-    elif hasattr(obj, "model_dump"):
+        return {
+            key: converted_value
+            for key, value in obj.items()
+            if (converted_value := _convert_to_dict(value)) is not None
+        }
+    elif isinstance(obj, (list, tuple)):
+        return [_convert_to_dict(item) for item in obj]
+
+    model_dump = getattr(obj, "model_dump", None)
+    if model_dump is not None:
         # Pydantic models - exclude None values
-        return obj.model_dump(exclude_none=True)
+        return model_dump(exclude_none=True)
     elif hasattr(obj, "__dict__"):
         # Regular objects - convert attributes to dict, skip None values
-        result = {}
-        for key, value in obj.__dict__.items():
-            if not key.startswith("_"):  # Skip private attributes
-                converted_value = _convert_to_dict(value)
-                if converted_value is not None:
-                    result[key] = converted_value
-        return result
+        return {
+            key: converted_value
+            for key, value in obj.__dict__.items()
+            if not key.startswith("_")  # Skip private attributes
+            and (converted_value := _convert_to_dict(value)) is not None
+        }
     else:
         # For other types, try to convert to string or return as-is
         try:
@@ -55,6 +104,74 @@ def _convert_to_dict(obj: Any) -> Any:
             return None
 
 
+def _writev_available(fd: int, buffers: List[bytes]) -> List[bytes]:
+    """Gather-write buffers to a non-blocking fd until the pipe is full.
+
+    Returns the buffers, or the unwritten tail of one, still to be sent.
+    """
+    index = 0
+    while index < len(buffers):
+        try:
+            written = os.writev(fd, buffers[index : index + _IOV_MAX])
+        except BlockingIOError:
+            break
+        while index < len(buffers) and written >= len(buffers[index]):
+            written -= len(buffers[index])
+            index += 1
+        if written:
+            buffers[index] = memoryview(buffers[index])[written:]
+    return buffers[index:]
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_main(module_path: str, function_name: str) -> Tuple[Callable, bool]:
+    """Import a server module once and report whether its main is async."""
+    main_func = getattr(importlib.import_module(module_path), function_name)
+    return main_func, inspect.iscoroutinefunction(main_func)
+
+
+class _ServerRuntime:
+    """Process-wide event loop thread shared by async MCP server mains.
+
+    Async servers are scheduled onto this loop instead of each getting a new
+    thread and event loop; sync mains still run on a dedicated thread. Mains
+    on the shared loop must be cooperative: one that blocks the loop stalls
+    it, so while any earlier server is still running the runtime reports
+    itself busy and new async mains get their own thread instead.
+    """
+
+    _singleton: Optional["_ServerRuntime"] = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self._active: Set[concurrent.futures.Future] = set()
+        self._loop = _new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mcp-server-runtime", daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> "_ServerRuntime":
+        """Return the shared runtime, starting its loop thread on first use."""
+        with cls._lock:
+            if cls._singleton is None:
+                cls._singleton = cls()
+            return cls._singleton
+
+    @property
+    def busy(self) -> bool:
+        """Whether a server scheduled earlier has not finished yet."""
+        return bool(self._active)
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the runtime loop."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        self._active.add(future)
+        future.add_done_callback(self._active.discard)
+        return future
+
+
 class SimpleThreadedMcpServer:
     """Threaded MCP server using real OS pipes for communication."""
 
@@ -62,6 +179,7 @@ class SimpleThreadedMcpServer:
         self.module_path = module_path
         self.function_name = function_name
         self.server_thread = None
+        self._server_future: Optional[concurrent.futures.Future] = None
         self.is_running = False
         self.shutdown_flag = threading.Event()
 
@@ -69,76 +187,246 @@ class SimpleThreadedMcpServer:
         self.stdin_read_fd, self.stdin_write_fd = os.pipe()
         self.stdout_read_fd, self.stdout_write_fd = os.pipe()
 
-        # Convert to file objects
+        # Only the server side needs file objects (it becomes sys.stdin/stdout);
+        # this side writes requests and reads responses on the raw descriptors
         self.stdin_read_file = os.fdopen(self.stdin_read_fd, "r")
-        self.stdin_write_file = os.fdopen(self.stdin_write_fd, "w")
-        self.stdout_read_file = os.fdopen(self.stdout_read_fd, "r")
         self.stdout_write_file = os.fdopen(self.stdout_write_fd, "w")
 
+        # Event-loop driven response reading: the loop watches the stdout pipe,
+        # buffers partial lines and resolves pending requests by JSON-RPC id
+        self._reader_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._rx_buf = bytearray()
+        self._pending: Dict[Any, asyncio.Future] = {}
+
+        # Frames queued during one loop iteration are written with one writev
+        self._tx_frames: List[bytes] = []
+
+        # Requests are written without blocking the caller's loop; whatever the
+        # pipe cannot take yet waits here until the loop reports it writable,
+        # so responses keep being read while a large batch is sent
+        os.set_blocking(self.stdin_write_fd, False)
+        self._tx_backlog: List[bytes] = []
+        self._writer_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def start(self):
-        """Start the MCP server in a thread."""
+        """Start the MCP server on the shared runtime, or in a thread of its own.
+
+        Sync mains always get a thread; async mains do while the runtime is busy.
+        """
         if self.is_running:
             return
 
-        self.server_thread = threading.Thread(target=self._run_server, daemon=True)
-        self.server_thread.start()
+        try:
+            main_func, is_async = _resolve_main(self.module_path, self.function_name)
+        except Exception:
+            # Let the thread path report the failure through the pipe
+            main_func, is_async = None, False
+
+        runtime = _ServerRuntime.get() if is_async else None
+        if runtime is not None and not runtime.busy:
+            self._server_future = runtime.submit(self._run_async_server(main_func))
+        else:
+            # Sync mains, and async mains while a previous server still holds the
+            # shared loop, run on a thread of their own
+            self.server_thread = threading.Thread(target=self._run_server, daemon=True)
+            self.server_thread.start()
         self.is_running = True
 
     def stop(self):
         """Stop the MCP server thread."""
+        if self.shutdown_flag.is_set():
+            return  # Already stopped, descriptors are closed
+
         self.shutdown_flag.set()
         self.is_running = False
+        self._detach_writer()
+        self._detach_reader(RuntimeError("Server stopped"))
 
         # Close write end to signal EOF to server
         try:
-            self.stdin_write_file.close()
-        except:
+            os.close(self.stdin_write_fd)
+        except OSError:
             pass
 
         if self.server_thread:
             self.server_thread.join(timeout=2.0)
+        elif self._server_future:
+            try:
+                self._server_future.result(timeout=2.0)
+            except Exception:
+                pass
 
         # Clean up remaining file descriptors
         try:
+            os.close(self.stdout_read_fd)
             self.stdin_read_file.close()
-            self.stdout_read_file.close()
             self.stdout_write_file.close()
         except:
             pass
 
-    def send_request(
+    async def request(
         self, request: Dict[str, Any], timeout: float = 30.0
-    ) -> Dict[str, Any]:
-        """Send request to server and get response."""
+    ) -> Optional[Dict[str, Any]]:
+        """Send request to server and await its response on the running event loop.
+
+        Notifications (requests without an id) are written without waiting.
+        """
+        return await self.request_frame(request.get("id"), _dumps(request), timeout)
+
+    async def request_frame(
+        self, request_id: Any, frame: bytes, timeout: float = 30.0
+    ) -> Optional[Dict[str, Any]]:
+        """Send an already serialized request and await its response.
+
+        The frame is the JSON message alone; the newline delimiter is added on write.
+
+        A request_id of None marks the frame as a notification, written without waiting.
+        """
         if not self.is_running:
             raise RuntimeError("Server not running")
 
+        if request_id is None:
+            self.send_notification(frame)
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self._reader_loop is None:
+            loop.add_reader(self.stdout_read_fd, self._on_readable)
+            self._reader_loop = loop
+
+        if request_id in self._pending:
+            raise RuntimeError(f"Request id {request_id!r} is already in flight")
+
+        future = loop.create_future()
+        self._pending[request_id] = future
         try:
-            # Send request through the pipe
-            json_data = json.dumps(request) + "\n"
-            self.stdin_write_file.write(json_data)
-            self.stdin_write_file.flush()
+            if not self._tx_frames:
+                loop.call_soon(self._flush_frames)
+            self._tx_frames.append(frame)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Request timed out after {timeout} seconds")
+        finally:
+            self._pending.pop(request_id, None)
 
-            # Read response with timeout
-            import select
+    def send_notification(self, frame: bytes):
+        """Write a serialized notification frame; notifications get no response."""
+        if not self.is_running:
+            raise RuntimeError("Server not running")
 
-            ready, _, _ = select.select([self.stdout_read_file], [], [], timeout)
-            if not ready:
-                raise TimeoutError(f"Request timed out after {timeout} seconds")
+        self._send([frame, _NL])
 
-            response_line = self.stdout_read_file.readline()
-            if not response_line:
-                raise RuntimeError("No response from MCP server")
+    def _flush_frames(self):
+        """Write every queued request frame to the server in a single batch."""
+        frames, self._tx_frames = self._tx_frames, []
+        if not self.is_running:
+            return
 
-            return json.loads(response_line.strip())
-        except Exception:
-            raise
+        try:
+            self._send([part for frame in frames for part in (frame, _NL)])
+        except OSError as e:
+            self._detach_reader(RuntimeError(f"Failed to write to MCP server: {e}"))
+
+    def _send(self, buffers: List[bytes]):
+        """Write buffers in order, leaving what does not fit for the writer callback."""
+        if not self._tx_backlog:
+            buffers = _writev_available(self.stdin_write_fd, buffers)
+            if not buffers:
+                return
+            loop = asyncio.get_running_loop()
+            loop.add_writer(self.stdin_write_fd, self._on_writable)
+            self._writer_loop = loop
+        self._tx_backlog.extend(buffers)
+
+    def _on_writable(self):
+        """Send as much of the backlog as the stdin pipe takes now."""
+        try:
+            self._tx_backlog = _writev_available(self.stdin_write_fd, self._tx_backlog)
+        except OSError as e:
+            self._detach_writer()
+            self._detach_reader(RuntimeError(f"Failed to write to MCP server: {e}"))
+            return
+        if not self._tx_backlog:
+            self._detach_writer()
+
+    def _detach_writer(self):
+        """Stop waiting for the stdin pipe and drop any unsent bytes."""
+        if self._writer_loop is not None:
+            try:
+                self._writer_loop.remove_writer(self.stdin_write_fd)
+            except Exception:
+                pass
+            self._writer_loop = None
+        self._tx_backlog = []
+
+    def _on_readable(self):
+        """Read available stdout data and resolve the requests it answers."""
+        # The loop reported the pipe readable, so this read does not block
+        chunk = os.read(self.stdout_read_fd, 65536)
+        if not chunk:
+            self._detach_reader(RuntimeError("No response from MCP server"))
+            return
+
+        rx_buf = self._rx_buf
+        rx_buf += chunk
+
+        # Parse every complete line in place, then drop them in one go
+        start = 0
+        while (newline := rx_buf.find(b"\n", start)) != -1:
+            line = rx_buf[start:newline]
+            start = newline + 1
+            try:
+                message = _loads(line)
+            except ValueError:
+                continue  # Skip blank or non-JSON output lines
+            if isinstance(message, dict):
+                self._resolve(message)
+        del rx_buf[:start]
+
+    def _resolve(self, message: Dict[str, Any]):
+        """Hand a response to the request waiting for its id."""
+        request_id = message.get("id")
+        if request_id is None and "error" in message:
+            # Server-level failure without an id answers every pending request
+            futures = list(self._pending.values())
+        else:
+            futures = [self._pending.get(request_id)]
+
+        for future in futures:
+            if future is not None and not future.done():
+                future.set_result(message)
+
+    def _detach_reader(self, error: Exception):
+        """Stop watching stdout and fail any requests still waiting."""
+        if self._reader_loop is not None:
+            try:
+                self._reader_loop.remove_reader(self.stdout_read_fd)
+            except Exception:
+                pass
+            self._reader_loop = None
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def _run_async_server(self, main_func):
+        """Run an async MCP server main on the shared runtime loop."""
+        old_stdin, old_stdout = sys.stdin, sys.stdout
+        try:
+            sys.stdin = self.stdin_read_file
+            sys.stdout = self.stdout_write_file
+            await main_func()
+        except Exception as e:
+            traceback.print_exc(file=sys.stderr)
+            self._write_error_response(e)
+        finally:
+            sys.stdin, sys.stdout = old_stdin, old_stdout
 
     def _run_server(self):
         """Run the MCP server in thread with real pipe-based I/O."""
         try:
-            module = importlib.import_module(self.module_path)
-            main_func = getattr(module, self.function_name)
+            main_func, is_async = _resolve_main(self.module_path, self.function_name)
 
             # Replace sys.stdin/stdout with our pipe file objects
             old_stdin, old_stdout, old_stderr = sys.stdin, sys.stdout, sys.stderr
@@ -148,19 +436,17 @@ class SimpleThreadedMcpServer:
                 sys.stdin = self.stdin_read_file
                 sys.stdout = self.stdout_write_file
 
-                # Create new event loop for this thread
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-
                 try:
                     if main_func:
-                        # Check if main_func is async
-                        import inspect
-
-                        if inspect.iscoroutinefunction(main_func):
-                            loop.run_until_complete(main_func())
+                        if is_async:
+                            # The shared runtime was busy, give this server its own loop
+                            loop = _new_event_loop()
+                            try:
+                                loop.run_until_complete(main_func())
+                            finally:
+                                loop.close()
                         else:
-                            # Sync main function - run it directly
+                            # Sync main function - run it directly, it manages its own loop
                             main_func()
                     else:
                         raise ValueError(
@@ -168,31 +454,27 @@ class SimpleThreadedMcpServer:
                         )
 
                 except Exception:
-                    import traceback
-
                     traceback.print_exc(file=sys.stderr)
                     raise
-                finally:
-                    loop.close()
 
             finally:
                 sys.stdin, sys.stdout, sys.stderr = old_stdin, old_stdout, old_stderr
 
         except Exception as e:
-            import traceback
-
             traceback.print_exc(file=sys.stderr)
-
-            # Send error response through stdout pipe
-            error_response = {
-                "jsonrpc": "2.0",
-                "error": {"code": -32603, "message": f"Server error: {str(e)}"},
-            }
-            try:
-                self.stdout_write_file.write(json.dumps(error_response) + "\n")
-                self.stdout_write_file.flush()
-            except:
-                pass
+            self._write_error_response(e)
+
+    def _write_error_response(self, error: Exception):
+        """Send an id-less error response through the stdout pipe."""
+        error_response = {
+            "jsonrpc": "2.0",
+            "error": {"code": -32603, "message": f"Server error: {str(error)}"},
+        }
+        try:
+            self.stdout_write_file.write(_dumps(error_response).decode() + "\n")
+            self.stdout_write_file.flush()
+        except:
+            pass
 
 
 class McpCaller:
@@ -226,26 +508,27 @@ class McpCaller:
             await asyncio.sleep(0.001)
 
             # Initialize the connection
-            init_request = {
-                "jsonrpc": self.config.jsonrpc,
-                "id": self._request_message_id,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": self.config.protocol_version,
-                    "capabilities": {},
-                    "clientInfo": {
-                        "name": "mcp-outlet-python",
-                        "version": "1.0.0",
-                    },
-                },
-            }
+            init_id = self._request_message_id
             self._request_message_id += 1
+            # Handshake frames are built from the config as it is at connect time
+            init_frame = _dumps(
+                {
+                    "jsonrpc": self.config.jsonrpc,
+                    "id": init_id,
+                    "method": "initialize",
+                    "params": {
+                        "protocolVersion": self.config.protocol_version,
+                        "capabilities": {},
+                        "clientInfo": {
+                            "name": "mcp-outlet-python",
+                            "version": "1.0.0",
+                        },
+                    },
+                }
+            )
 
             # Send initialize request with shorter timeout since server should respond quickly
-            loop = asyncio.get_event_loop()
-            init_response = await loop.run_in_executor(
-                None, self._server.send_request, init_request, 30.0
-            )
+            init_response = await self._server.request_frame(init_id, init_frame, 30.0)
 
             if "error" in init_response:
                 raise CustomError(
@@ -255,20 +538,16 @@ class McpCaller:
 
             self.server_info = init_response.get("result", {})
 
-            # Send initialized notification
-            initialized_request = {
-                "jsonrpc": self.config.jsonrpc,
-                "method": "notifications/initialized",
-                "params": {},
-            }
-
-            # For notifications, we don't wait for response
-            try:
-                await loop.run_in_executor(
-                    None, self._server.send_request, initialized_request, 0.00001
+            # Send initialized notification, we don't wait for response
+            self._server.send_notification(
+                _dumps(
+                    {
+                        "jsonrpc": self.config.jsonrpc,
+                        "method": "notifications/initialized",
+                        "params": {},
+                    }
                 )
-            except:
-                pass  # Notifications might not return anything
+            )
 
             self._is_connected = True
             return self.server_info
@@ -300,68 +579,86 @@ class McpCaller:
         Returns:
             Response from the MCP server
         """
+        (result,) = await self.execute_many([input_request], tracer)
+        return result
+
+    async def execute_many(
+        self, input_requests: List[Dict[str, Any]], tracer: Optional[Tracer] = None
+    ) -> List[Union[Dict[str, Any], Any]]:
+        """Execute several MCP calls against the connected server concurrently.
+
+        All request frames are written to the server in one batch and responses
+        are matched back to their requests by id as they arrive.
+
+        Args:
+            input_requests: JSON-RPC requests to send to the MCP server
+            tracer: Optional tracer instance for operation tracking
+
+        Returns:
+            Responses from the MCP server, in request order
+        """
         # Ensure we're connected
         if not self._is_connected or not self._server:
             raise CustomError(CustomErrorCode.CONNECTION_CLOSED, "Not connected")
 
         # Handle initialize method specially
-        if input_request.get("method") == "initialize":
-            if self.server_info:
-                return _convert_to_dict(self.server_info)
-            else:
-                raise CustomError(
-                    CustomErrorCode.INVALID_REQUEST, "Please connect first"
-                )
-
-        captured_logs: List[str] = []
+        if not self.server_info and any(
+            request.get("method") == "initialize" for request in input_requests
+        ):
+            raise CustomError(CustomErrorCode.INVALID_REQUEST, "Please connect first")
+
+        # Responses are matched by id, so every request in the batch needs its own
+        calls = [
+            request
+            for request in input_requests
+            if request.get("method") != "initialize"
+        ]
+        used_ids = set()
+        for request in calls:
+            if "id" in request:
+                request_id = request["id"]
+                if request_id is None or request_id in used_ids:
+                    raise CustomError(
+                        CustomErrorCode.INVALID_REQUEST,
+                        f"Invalid or duplicate request id: {request_id!r}",
+                    )
+                used_ids.add(request_id)
+
+        # Assign message IDs where not present, skipping ids the batch already uses
+        for request in calls:
+            if "id" not in request:
+                while self._request_message_id in used_ids:
+                    self._request_message_id += 1
+                request["id"] = self._request_message_id
+                self._request_message_id += 1
 
-        # Store original console methods and set up capture
+        # Tool output must never reach the protocol pipe, so stdout/stderr are
+        # always redirected; it is only kept when a tracer will record it
         original_stdout = sys.stdout
         original_stderr = sys.stderr
-        stdout_capture = StringIO()
-        stderr_capture = StringIO()
-
-        def safe_capture(level: str, content: str) -> None:
-            try:
-                if content.strip():
-                    captured_logs.append(f"[{level}] {content.strip()}")
-            except Exception:
-                pass
+        if tracer:
+            stdout_capture = StringIO()
+            stderr_capture = StringIO()
+        else:
+            stdout_capture = stderr_capture = _DISCARD_OUTPUT
+
+        def captured_metadata() -> Dict[str, Any]:
+            captured_logs: List[str] = []
+            for level, capture in (("LOG", stdout_capture), ("ERROR", stderr_capture)):
+                content = capture.getvalue().strip()
+                if content:
+                    captured_logs.append(f"[{level}] {content}")
+            return {"logs": captured_logs} if captured_logs else {}
 
         try:
             # Set up console capture
             sys.stdout = stdout_capture
             sys.stderr = stderr_capture
 
-            # Assign message ID if not present
-            if "id" not in input_request:
-                input_request["id"] = self._request_message_id
-                self._request_message_id += 1
-
-            # Send request to threaded server
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, self._server.send_request, input_request, 30.0
+            results = await asyncio.gather(
+                *(self._send_mcp_request(request) for request in input_requests)
             )
 
-            # Capture any output
-            stdout_content = stdout_capture.getvalue()
-            stderr_content = stderr_capture.getvalue()
-
-            if stdout_content:
-                safe_capture("LOG", stdout_content)
-            if stderr_content:
-                safe_capture("ERROR", stderr_content)
-
-            # Handle response
-            if "error" in response:
-                error_data = response["error"]
-                raise CustomError(
-                    CustomErrorCode.INTERNAL_ERROR,
-                    error_data.get("message", "MCP server error"),
-                    error_data,
-                )
-
             # Handle tracing for successful response
             if tracer:
                 tracer.merge_child_trace(
@@ -369,22 +666,12 @@ class McpCaller:
                     "executeMcpCall",
                     True,
                     [],
-                    {"logs": captured_logs} if captured_logs else {},
+                    captured_metadata(),
                 )
 
-            # Return just the result data
-            return _convert_to_dict(response.get("result"))
+            return results
 
         except Exception as error:
-            # Capture any output from error case
-            stdout_content = stdout_capture.getvalue()
-            stderr_content = stderr_capture.getvalue()
-
-            if stdout_content:
-                safe_capture("LOG", stdout_content)
-            if stderr_content:
-                safe_capture("ERROR", stderr_content)
-
             # Handle tracing for error response
             if tracer:
                 tracer.merge_child_trace(
@@ -392,10 +679,32 @@ class McpCaller:
                     "mcpCall",
                     False,
                     [],
-                    {"logs": captured_logs} if captured_logs else {},
+                    captured_metadata(),
                 )
             raise error
         finally:
             # Restore console
             sys.stdout = original_stdout
             sys.stderr = original_stderr
+
+    async def _send_mcp_request(
+        self, input_request: Dict[str, Any]
+    ) -> Union[Dict[str, Any], Any]:
+        """Send one request to the threaded server and unwrap its result."""
+        if input_request.get("method") == "initialize":
+            return _convert_to_dict(self.server_info)
+
+        # Send request to threaded server
+        response = await self._server.request(input_request, 30.0)
+
+        # Handle response
+        if "error" in response:
+            error_data = response["error"]
+            raise CustomError(
+                CustomErrorCode.INTERNAL_ERROR,
+                error_data.get("message", "MCP server error"),
+                error_data,
+            )
+
+        # Return just the result data
+        return _convert_to_dict(response.get("result"))
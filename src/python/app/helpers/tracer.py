@@ -4,10 +4,10 @@ This module provides comprehensive tracing with exact same API as TypeScript ver
 ensuring consistent tracing behavior across implementations.
 """
 
+import copy
 import time
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Union
-from app.helpers.schema import TraceSpan
 
 
 class Tracer:
@@ -19,7 +19,13 @@ class Tracer:
         parent: Optional[str] = None,
         additional_data: Optional[Dict[str, Any]] = None,
     ):
-        self.spans: List[TraceSpan] = []
+        # Spans are kept as plain dicts already in the camelCase output shape,
+        # so get_trace can hand them out without validating or renaming fields
+        self.spans: List[Dict[str, Any]] = []
+        # Only record_span creates running spans and it keeps at most one open;
+        # its start is kept in integer nanoseconds for an exact duration
+        self._running_span: Optional[Dict[str, Any]] = None
+        self._running_start_ns = 0
         self.trace_id = trace_id
         self.start_time = datetime.now()
         self.end_time: Optional[datetime] = None
@@ -31,23 +37,28 @@ class Tracer:
         name: str,
         parent_seq: Optional[str] = None,
         additional_data: Optional[Dict[str, Any]] = None,
-    ) -> TraceSpan:
+    ) -> Dict[str, Any]:
         """Record a new span, ending the previous running span if exists."""
 
         # End previous span if exists
-        if self.spans and self.spans[-1].status == "running":
-            self._end_previous_span(self.spans[-1], False)
-
-        span = TraceSpan(
-            seq=name,
-            parent_seq=parent_seq or self.current_parent,
-            start_time=time.time() * 1000,  # Convert to milliseconds
-            status="running",
-            data=additional_data,
-            is_valid=True,
-        )
+        if self._running_span is not None:
+            self._end_previous_span(False)
+
+        start_ns = time.time_ns()
+        span = {
+            "seq": name,
+            "parentSeq": parent_seq or self.current_parent,
+            "startTime": start_ns / 1e6,  # Convert to milliseconds
+            "duration": None,
+            "status": "running",
+            "error": None,
+            "data": additional_data,
+            "isValid": True,
+        }
 
         self.spans.append(span)
+        self._running_span = span
+        self._running_start_ns = start_ns
         return span
 
     def merge_child_trace(
@@ -55,7 +66,7 @@ class Tracer:
         base_seq: str,
         parent_seq: str,
         is_success: bool,
-        child_trace: Union[Dict[str, Any], List[TraceSpan], Dict[str, Any]],
+        child_trace: Union[Dict[str, Any], List[Dict[str, Any]]],
         additional_data: Optional[Dict[str, Any]] = None,
     ):
         """Merge child trace data into current trace."""
@@ -63,52 +74,36 @@ class Tracer:
         status = "success" if is_success else "error"
         additional_data = additional_data or {}
 
+        handler = _MERGE_HANDLERS.get(type(child_trace), Tracer._create_fallback_span)
         try:
-            # Try to parse as dict with trace structure
-            if isinstance(child_trace, dict):
-                try:
-                    # Check if it has trace structure
-                    if "spans" in child_trace and isinstance(
-                        child_trace["spans"], list
-                    ):
-                        self._merge_spans_array(
-                            child_trace["spans"],
-                            base_seq,
-                            parent_seq,
-                            status,
-                            additional_data,
-                        )
-                        # Merge trace additional data
-                        if "data" in child_trace:
-                            self._merge_trace_data(child_trace["data"], additional_data)
-                        return
-                    else:
-                        # Single span-like object
-                        self._create_fallback_span(
-                            child_trace, base_seq, parent_seq, status, additional_data
-                        )
-                        return
-                except Exception:
-                    pass
-
-            # Try to handle as spans array
-            if isinstance(child_trace, list):
-                self._merge_spans_array(
-                    child_trace, base_seq, parent_seq, status, additional_data
-                )
-                return
-
-            # Fallback: create a single span for the invalid trace
-            self._create_fallback_span(
-                child_trace, base_seq, parent_seq, status, additional_data
-            )
-
+            handler(self, child_trace, base_seq, parent_seq, status, additional_data)
         except Exception as error:
             # Create error span for any parsing errors
             self._create_error_span(
                 child_trace, base_seq, parent_seq, status, additional_data, str(error)
             )
 
+    def _merge_trace_dict(
+        self,
+        child_trace: Dict[str, Any],
+        base_seq: str,
+        parent_seq: str,
+        status: str,
+        additional_data: Dict[str, Any],
+    ):
+        """Merge a trace-shaped dict, or record it as a single fallback span."""
+        spans = child_trace.get("spans")
+        if not isinstance(spans, list):
+            self._create_fallback_span(
+                child_trace, base_seq, parent_seq, status, additional_data
+            )
+            return
+
+        self._merge_spans_array(spans, base_seq, parent_seq, status, additional_data)
+        # Merge trace additional data
+        if "data" in child_trace:
+            self._merge_trace_data(child_trace["data"], additional_data)
+
     def _merge_spans_array(
         self,
         spans: List[Any],
@@ -121,17 +116,27 @@ class Tracer:
         for span_data in spans:
             try:
                 if isinstance(span_data, dict):
-                    merged_span = TraceSpan(
-                        seq=f"{base_seq}.{span_data.get('seq', 'unknown_span')}",
-                        parent_seq=span_data.get("parent_seq") or parent_seq,
-                        start_time=span_data.get("start_time", time.time() * 1000),
-                        duration=span_data.get("duration"),
-                        status=span_data.get("status") or status,
-                        error=span_data.get("error"),
-                        data={**additional_data, **(span_data.get("data") or {})},
-                        is_valid=False,
-                    )
-                    self.spans.append(merged_span)
+                    get = span_data.get
+                    span_extra = get("data")
+                    if not additional_data:
+                        data = span_extra or {}
+                    else:
+                        data = additional_data.copy()
+                        if span_extra:
+                            data.update(span_extra)
+
+                    merged_span = {
+                        "seq": f"{base_seq}.{get('seq', 'unknown_span')}",
+                        "parentSeq": get("parent_seq") or parent_seq,
+                        "startTime": get("start_time", time.time_ns() / 1e6),
+                        "duration": get("duration"),
+                        "status": get("status") or status,
+                        "error": get("error"),
+                        "data": data,
+                        "isValid": False,
+                    }
+                    if _is_valid_span(merged_span):
+                        self.spans.append(merged_span)
             except Exception:
                 # Skip invalid span data
                 continue
@@ -163,15 +168,16 @@ class Tracer:
         if isinstance(child_trace, dict):
             trace_id = child_trace.get("trace_id") or child_trace.get("seq") or trace_id
 
-        span = TraceSpan(
-            seq=f"{base_seq}.{trace_id}",
-            parent_seq=parent_seq,
-            start_time=time.time() * 1000,
-            status=status,
-            duration=0,
-            data={**additional_data, "child_trace": child_trace},
-            is_valid=False,
-        )
+        span = {
+            "seq": f"{base_seq}.{trace_id}",
+            "parentSeq": parent_seq,
+            "startTime": time.time_ns() / 1e6,
+            "duration": 0,
+            "status": status,
+            "error": None,
+            "data": {**additional_data, "child_trace": child_trace},
+            "isValid": False,
+        }
         self.spans.append(span)
 
     def _create_error_span(
@@ -188,23 +194,24 @@ class Tracer:
         if isinstance(child_trace, dict):
             trace_id = child_trace.get("seq") or child_trace.get("trace_id") or trace_id
 
-        span = TraceSpan(
-            seq=f"{base_seq}.{trace_id}",
-            parent_seq=parent_seq,
-            start_time=time.time() * 1000,
-            status=status,
-            duration=0,
-            error=error_message,
-            data={**additional_data, "child_trace": child_trace},
-            is_valid=False,
-        )
+        span = {
+            "seq": f"{base_seq}.{trace_id}",
+            "parentSeq": parent_seq,
+            "startTime": time.time_ns() / 1e6,
+            "duration": 0,
+            "status": status,
+            "error": error_message,
+            "data": {**additional_data, "child_trace": child_trace},
+            "isValid": False,
+        }
         self.spans.append(span)
 
-    def _end_previous_span(self, span: TraceSpan, is_error: bool):
-        """End a span by calculating duration and setting status."""
-        end_time = time.time() * 1000
-        span.duration = end_time - span.start_time
-        span.status = "error" if is_error else "success"
+    def _end_previous_span(self, is_error: bool):
+        """End the running span by calculating duration and setting status."""
+        span = self._running_span
+        span["duration"] = (time.time_ns() - self._running_start_ns) / 1e6
+        span["status"] = "error" if is_error else "success"
+        self._running_span = None
 
     def _end(self):
         """End the trace by setting end time."""
@@ -214,25 +221,9 @@ class Tracer:
     def get_trace(self, last_span_success: bool = True) -> Dict[str, Any]:
         """Get the final trace with all spans completed."""
 
-        # End any running spans
-        for span in self.spans:
-            if span.status == "running":
-                self._end_previous_span(span, not last_span_success)
-
-        # Convert spans to output format (ensuring all fields are present)
-        output_spans = []
-        for span in self.spans:
-            output_span = {
-                "seq": span.seq,
-                "parentSeq": span.parent_seq,
-                "startTime": span.start_time,
-                "duration": span.duration,
-                "status": span.status,
-                "error": span.error,
-                "data": span.data,
-                "isValid": span.is_valid,
-            }
-            output_spans.append(output_span)
+        # End the running span, if any
+        if self._running_span is not None:
+            self._end_previous_span(not last_span_success)
 
         self._end()
 
@@ -241,6 +232,33 @@ class Tracer:
             "startTime": self.start_time.isoformat() if self.start_time else None,
             "endTime": self.end_time.isoformat() if self.end_time else None,
             "data": self.trace_additional_data,
-            "spans": output_spans,
+            # Copied so changes to the returned trace never reach the tracer
+            "spans": copy.deepcopy(self.spans),
             "isValid": True,
         }
+
+
+_SPAN_STATUSES = frozenset(("running", "success", "error"))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_valid_span(span: Dict[str, Any]) -> bool:
+    """Check a merged span against the TraceSpan field types."""
+    return (
+        _is_number(span["startTime"])
+        and (span["duration"] is None or _is_number(span["duration"]))
+        and span["status"] in _SPAN_STATUSES
+        and (span["parentSeq"] is None or isinstance(span["parentSeq"], str))
+        and (span["error"] is None or isinstance(span["error"], str))
+        and isinstance(span["data"], dict)
+    )
+
+
+# merge_child_trace handlers keyed on the child trace type, other types fall back
+_MERGE_HANDLERS = {
+    dict: Tracer._merge_trace_dict,
+    list: Tracer._merge_spans_array,
+}
@@ -1,16 +1,186 @@
+import argparse
+import copy
 import subprocess
-import json
-from typing import Optional, List, Dict, Tuple
+from collections import ChainMap
+from typing import Optional, List, Dict, Set, Tuple
+import functools
+import importlib
+import importlib.metadata as _importlib_metadata
+import importlib.util as _importlib_util
 import os
+import site
 import sys
 
+# uvx-style server arguments; unknown flags are left in the remaining args
+_ARGS_PARSER = argparse.ArgumentParser(
+    add_help=False, allow_abbrev=False, exit_on_error=False
+)
+_ARGS_PARSER.add_argument("--from", dest="source_path")
+_ARGS_PARSER.add_argument("--with", dest="with_deps", action="append", default=[])
+_ARGS_PARSER.add_argument("--index-url", dest="index_url")
+_ARGS_PARSER.add_argument(
+    "--extra-index-url", dest="extra_index_urls", action="append", default=[]
+)
+# Unsupported uvx options that take a value, parsed only so the value is not
+# mistaken for the package name
+for _options in (
+    ("--python", "-p"),
+    ("--with-editable",),
+    ("--with-requirements",),
+    ("--index",),
+    ("--default-index",),
+    ("--find-links", "-f"),
+    ("--index-strategy",),
+    ("--keyring-provider",),
+    ("--allow-insecure-host",),
+    ("--cache-dir",),
+    ("--constraints", "--constraint", "-c"),
+    ("--overrides", "--override"),
+    ("--build-constraints", "--build-constraint", "-b"),
+    ("--exclude-newer",),
+    ("--exclude-newer-package",),
+    ("--refresh-package",),
+    ("--upgrade-package", "-P"),
+    ("--reinstall-package",),
+    ("--no-build-isolation-package",),
+    ("--no-binary-package",),
+    ("--no-build-package",),
+    ("--prerelease",),
+    ("--resolution",),
+    ("--config-setting", "-C"),
+    ("--link-mode",),
+    ("--torch-backend",),
+    ("--python-preference",),
+    ("--python-platform",),
+    ("--env-file",),
+    ("--config-file",),
+    ("--directory",),
+    ("--project",),
+    ("--color",),
+):
+    _ARGS_PARSER.add_argument(*_options, action="append", help=argparse.SUPPRESS)
+
+# uvx flags known to take no value; any other unrecognised option is assumed
+# to take one, so the token after it is never installed as the package
+_BOOLEAN_FLAGS = frozenset(
+    (
+        "--quiet",
+        "--verbose",
+        "--no-cache",
+        "--offline",
+        "--isolated",
+        "--no-config",
+        "--native-tls",
+        "--no-progress",
+        "--no-python-downloads",
+        "--managed-python",
+        "--no-managed-python",
+        "--refresh",
+        "--upgrade",
+        "--reinstall",
+        "--no-build-isolation",
+        "--no-build",
+        "--no-binary",
+        "--no-sources",
+        "--no-index",
+        "--compile-bytecode",
+        "--lfs",
+        "--preview",
+        "--no-preview",
+        "--no-env-file",
+        "--show-settings",
+        "--help",
+        "--version",
+    )
+)
+# Single-letter boolean flags, which may be bundled ("-qq", "-vU")
+_BOOLEAN_SHORT_FLAGS = frozenset("qvnUhV")
 
-def setup_uv_environment():
-    env = os.environ.copy()
-    cache_dir = env.get("CACHE_DIR", "/mnt/cache")
 
-    # Create installation directory within cache
-    import site
+def _takes_value(option: str) -> bool:
+    """Whether an unrecognised option is assumed to consume the next token."""
+    if "=" in option or option in _BOOLEAN_FLAGS:
+        return False
+    if not option.startswith("--"):
+        return not set(option[1:]) <= _BOOLEAN_SHORT_FLAGS
+    return True
+
+
+# Successful parse_mcp_server_params results keyed by the argument tuple
+_result_cache: Dict[Tuple[str, ...], Dict[str, any]] = {}
+
+# uv-specific environment overrides keyed by (CACHE_DIR, PYTHONPATH, sys.path);
+# they are layered over the live os.environ rather than copied into it
+_env_cache: Dict[Tuple[str, str, Tuple[str, ...]], Dict[str, str]] = {}
+_made_dirs: Set[str] = set()
+
+# Normalized names of installed distributions, scanned once per process
+_dist_names: Optional[Set[str]] = None
+
+
+def _normalize_dist_name(name: str) -> str:
+    return name.lower().replace("-", "_").replace(".", "_")
+
+
+def _installed_dist_names() -> Set[str]:
+    global _dist_names
+    if _dist_names is None:
+        _dist_names = {
+            _normalize_dist_name(name)
+            for dist in _importlib_metadata.distributions()
+            if (name := dist.metadata["Name"])
+        }
+    return _dist_names
+
+
+@functools.lru_cache(maxsize=None)
+def _is_package_installed(pkg: str) -> bool:
+    """Return True if *pkg* is already importable in the current environment."""
+    if _normalize_dist_name(pkg) in _installed_dist_names():
+        return True
+
+    try:
+        return _importlib_util.find_spec(pkg.replace("-", "_")) is not None
+    except (ImportError, ValueError):
+        # Dotted names whose parent package is missing
+        return False
+
+
+def _invalidate_dist_cache():
+    """Forget installed-package lookups so fresh installs become visible."""
+    global _dist_names
+    _dist_names = None
+    _is_package_installed.cache_clear()
+    _result_cache.clear()
+    importlib.invalidate_caches()
+
+
+def _module_available(module_path: str) -> bool:
+    """Whether a module can still be found on the current search path."""
+    try:
+        return _importlib_util.find_spec(module_path) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def _site_package_dirs() -> Tuple[str, ...]:
+    """Site and user site-packages directories, fixed for the process lifetime."""
+    site_dirs = []
+    current_site_packages = site.getsitepackages()
+    if isinstance(current_site_packages, list):
+        site_dirs.extend(current_site_packages)
+    else:
+        site_dirs.append(current_site_packages)
+
+    user_site = site.getusersitepackages()
+    if user_site:
+        site_dirs.append(user_site)
+    return tuple(site_dirs)
+
+
+def setup_uv_environment():
+    cache_dir = os.environ.get("CACHE_DIR", "/mnt/cache")
 
     # UV will install packages into cache_dir/lib/python{version}/site-packages
     python_version = f"{sys.version_info.major}.{sys.version_info.minor}"
@@ -19,141 +189,136 @@ def setup_uv_environment():
     )
 
     # Ensure the directory exists
-    os.makedirs(uv_install_dir, exist_ok=True)
+    if uv_install_dir not in _made_dirs:
+        os.makedirs(uv_install_dir, exist_ok=True)
+        _made_dirs.add(uv_install_dir)
 
     # Add UV installation directory to current runtime
     if uv_install_dir not in sys.path:
         sys.path.insert(0, uv_install_dir)  # Insert at beginning for priority
 
+    # Reuse the environment built for the same cache dir and search paths
+    existing_path = os.environ.get("PYTHONPATH", "")
+    cache_key = (cache_dir, existing_path, tuple(sys.path))
+    overrides = _env_cache.get(cache_key)
+    if overrides is not None:
+        return ChainMap(dict(overrides), os.environ)
+
     python_paths = []
 
     # Add UV installation directory first (highest priority)
     python_paths.append(uv_install_dir)
 
-    # Add current site-packages (read-only)
-    current_site_packages = site.getsitepackages()
-    if isinstance(current_site_packages, list):
-        python_paths.extend(current_site_packages)
-    else:
-        python_paths.append(current_site_packages)
-
-    # Add user site-packages (read-only)
-    user_site = site.getusersitepackages()
-    if user_site:
-        python_paths.append(user_site)
+    # Add current and user site-packages (read-only)
+    python_paths.extend(_site_package_dirs())
 
     # Add sys.path directories (current Python environment - read-only)
     python_paths.extend(sys.path)
 
     # Add existing PYTHONPATH if any
-    existing_path = env.get("PYTHONPATH", "")
     if existing_path:
         python_paths.extend(existing_path.split(":"))
 
     # Remove duplicates and empty paths while preserving order
-    seen = set()
-    python_paths = [p for p in python_paths if p and p not in seen and not seen.add(p)]
-
-    env.update(
-        {
-            "UV_CACHE_DIR": cache_dir,  # Set cache directory
-            "UV_LINK_MODE": "copy",  # Use copy mode instead of hardlinks/symlinks
-            "UV_NO_SYNC": "1",  # Don't sync lock file
-            "UV_COMPILE_BYTECODE": "0",  # Don't compile bytecode
-            "UV_NO_PROJECT": "1",  # Completely ignore project (.venv) for installation
-            "UV_BREAK_SYSTEM_PACKAGES": "1",  # Allow installation without virtual env
-            "PYTHONPATH": ":".join(
-                python_paths
-            ),  # UV packages first, then current packages (.venv included for reading)
-        }
-    )
+    python_paths = list(dict.fromkeys(filter(None, python_paths)))
+
+    overrides = {
+        "UV_CACHE_DIR": cache_dir,  # Set cache directory
+        "UV_LINK_MODE": "copy",  # Use copy mode instead of hardlinks/symlinks
+        "UV_NO_SYNC": "1",  # Don't sync lock file
+        "UV_COMPILE_BYTECODE": "0",  # Don't compile bytecode
+        "UV_NO_PROJECT": "1",  # Completely ignore project (.venv) for installation
+        "UV_BREAK_SYSTEM_PACKAGES": "1",  # Allow installation without virtual env
+        "PYTHONPATH": ":".join(
+            python_paths
+        ),  # UV packages first, then current packages (.venv included for reading)
+    }
 
-    return env
+    _env_cache[cache_key] = overrides
+    return ChainMap(dict(overrides), os.environ)
 
 
-def parse_mcp_server_params(args: List[str]) -> Dict[str, any]:
+def parse_mcp_server_params(args: List[str], refresh: bool = False) -> Dict[str, any]:
     """
     Parse uvx/uv/pip style arguments, execute uv add and uv inspect, return import info.
 
     Args:
         args: List of arguments like ['--from', 'git+https://...', 'package-name:entry', '--with', 'dep']
+        refresh: Resolve again even if these arguments were resolved before
 
     Returns:
         Dict with module_path, function_name, and metadata
     """
 
+    # A resolved argument list is reused while its entry module can still be
+    # found; otherwise it was removed from the cache dir and is resolved again
+    cache_key = tuple(args)
+    if not refresh:
+        cached_result = _result_cache.get(cache_key)
+        if cached_result is not None:
+            if _module_available(cached_result["module_path"]):
+                return copy.deepcopy(cached_result)
+            _invalidate_dist_cache()
+
     # Setup UV environment
     env = setup_uv_environment()
 
     # Get the installation directory from cache_dir
     cache_dir = env.get("UV_CACHE_DIR", ".mcp-outlet-cache")
 
-    # Parse state
+    try:
+        parsed, remaining = _ARGS_PARSER.parse_known_args(args)
+    except argparse.ArgumentError as e:
+        raise ValueError(f"Invalid server arguments: {e}")
+
+    source_path = parsed.source_path
+    with_deps = [dep for value in parsed.with_deps for dep in value.split(",")]
+    index_url = parsed.index_url
+    extra_index_urls = parsed.extra_index_urls
+
+    # First positional argument is the package name (possibly with entry point);
+    # unsupported flags (--quiet, --verbose, etc.) and extra arguments are ignored,
+    # as is the value following any other unrecognised option
     package_name = None
     entry_point = None
-    source_path = None
-    with_deps = []
-    index_url = None
-    extra_index_urls = []
-
-    i = 0
-    while i < len(args):
-        arg = args[i]
-
-        if arg == "--from" and i + 1 < len(args):
-            source_path = args[i + 1]
-            i += 2
-        elif arg == "--with" and i + 1 < len(args):
-            with_deps.extend(args[i + 1].split(","))
-            i += 2
-        elif arg == "--index-url" and i + 1 < len(args):
-            index_url = args[i + 1]
-            i += 2
-        elif arg == "--extra-index-url" and i + 1 < len(args):
-            extra_index_urls.append(args[i + 1])
-            i += 2
-        elif arg.startswith("--"):
-            # Skip unsupported options (--quiet, --verbose, etc.)
-            if i + 1 < len(args) and not args[i + 1].startswith("--"):
-                i += 2  # Skip option + value
-            else:
-                i += 1  # Skip option only
-        elif not package_name:
-            # First non-option argument is package name (possibly with entry point)
-            if ":" in arg:
-                package_name, entry_point = arg.split(":", 1)
-            else:
-                package_name = arg
-            i += 1
+    package_arg = None
+    skipped_option = None
+    skip_next = False
+    for arg in remaining:
+        if arg.startswith("-"):
+            skip_next = _takes_value(arg)
+            if skip_next:
+                skipped_option = skipped_option or arg
+        elif skip_next:
+            skip_next = False
+        else:
+            package_arg = arg
+            break
+    if package_arg:
+        if ":" in package_arg:
+            package_name, entry_point = package_arg.split(":", 1)
         else:
-            # Additional arguments (ignore for now)
-            i += 1
+            package_name = package_arg
 
     if not package_name:
+        if skipped_option:
+            raise ValueError(
+                "No package name found in arguments; the value after the "
+                f"unrecognised option {skipped_option} was not used as one"
+            )
         raise ValueError("No package name found in arguments")
 
-    def _is_package_installed(pkg: str) -> bool:
-        """Return True if *pkg* is already importable in the current environment."""
-        try:
-            import importlib.metadata as _importlib_metadata
-
-            _importlib_metadata.version(pkg)
-            return True
-        except _importlib_metadata.PackageNotFoundError:
-            pass
-        except Exception:
-            # Fallback to importlib.util.find_spec
-            pass
-
-        import importlib.util as _importlib_util
-
-        return _importlib_util.find_spec(pkg.replace("-", "_")) is not None
-
     # ------------------------------------------------------------
-    # Install main package if it is not already present
+    # Install the main package and any --with dependencies that are
+    # not yet present, all in one uv invocation so they share a single
+    # resolution
     # ------------------------------------------------------------
-
+    to_install = [dep for dep in with_deps if not _is_package_installed(dep)]
     if not _is_package_installed(package_name):
+        # Prefer the explicit source over the bare package name
+        to_install.insert(0, source_path or package_name)
+
+    if to_install:
         uv_add_cmd = ["uv", "pip", "install", "--prefix", cache_dir]
 
         # Add index URLs
@@ -162,42 +327,22 @@ def parse_mcp_server_params(args: List[str]) -> Dict[str, any]:
         for extra_url in extra_index_urls:
             uv_add_cmd.extend(["--extra-index-url", extra_url])
 
-        # Add source if specified
-        if source_path:
-            uv_add_cmd.append(source_path)
-        else:
-            # Add package name (without entry point)
-            uv_add_cmd.append(package_name)
+        uv_add_cmd.extend(to_install)
 
         # Execute uv install to cache directory only
         try:
             subprocess.run(
                 uv_add_cmd,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,  # Only stderr is needed on failure
+                stderr=subprocess.PIPE,
                 text=True,
-                timeout=120,
+                timeout=max(120, 60 * len(to_install)),
                 check=True,
                 env=env,
             )
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"uv install failed: {e.stderr}")
-
-    # ------------------------------------------------------------
-    # Install any --with dependencies that are not yet installed
-    # ------------------------------------------------------------
-    for dep in with_deps:
-        if _is_package_installed(dep):
-            continue
-
-        dep_cmd = ["uv", "pip", "install", "--prefix", cache_dir, dep]
-        subprocess.run(
-            dep_cmd,
-            capture_output=True,
-            text=True,
-            timeout=500,
-            check=True,
-            env=env,
-        )
+        _invalidate_dist_cache()
 
     # ------------------------------------------------------------------
     # Step 2: Retrieve package metadata and entry points using Python's
@@ -210,8 +355,6 @@ def parse_mcp_server_params(args: List[str]) -> Dict[str, any]:
     entry_points: Dict = {}
 
     try:
-        import importlib.metadata as _importlib_metadata
-
         # Basic metadata (name, version, etc.)
         meta = _importlib_metadata.metadata(package_name)
         inspection_data = {k.lower().replace("-", "_"): v for k, v in meta.items()}
@@ -225,9 +368,12 @@ def parse_mcp_server_params(args: List[str]) -> Dict[str, any]:
             else:
                 eps = eps.get("console_scripts", [])  # type: ignore[attr-defined]
 
-            entry_points = {
+            # Same shape resolve_entry_point expects from installer metadata
+            console_scripts = {
                 ep.name: ep.value for ep in eps if ep.dist.name == package_name
             }
+            if console_scripts:
+                entry_points = {"console_scripts": console_scripts}
         except Exception:
             # Best-effort only – ignore on failure
             pass
@@ -257,35 +403,12 @@ def parse_mcp_server_params(args: List[str]) -> Dict[str, any]:
     # End of metadata retrieval section (no additional subprocesses).
     # ------------------------------------------------------------------
 
-    # Step 4: Try to get more detailed entry points
-    entry_points = {}
-    try:
-        # Try uv pip inspect for more detailed info
-        detailed_inspect_cmd = ["uv", "pip", "inspect", package_name]
-        detailed_result = subprocess.run(
-            detailed_inspect_cmd,
-            capture_output=True,
-            text=True,
-            timeout=10,
-            check=False,  # Don't fail if inspect not available
-            env=env,
-        )
-        if detailed_result.returncode == 0:
-            try:
-                detailed_data = json.loads(detailed_result.stdout)
-                if "entry_points" in detailed_data:
-                    entry_points = detailed_data["entry_points"]
-            except json.JSONDecodeError:
-                pass
-    except Exception:
-        pass
-
     # Step 5: Determine module path and function name
     module_path, function_name = resolve_entry_point(
         package_name, entry_point, entry_points, inspection_data
     )
 
-    return {
+    result = {
         "package_name": package_name,
         "module_path": module_path,
         "function_name": function_name,
@@ -296,15 +419,23 @@ def parse_mcp_server_params(args: List[str]) -> Dict[str, any]:
         "entry_points": entry_points,
         "install_success": True,
     }
+    _result_cache[cache_key] = result
+    return copy.deepcopy(result)
 
 
 def parse_uv_show_output(output: str) -> Dict[str, str]:
     """Parse uv pip show output into key-value pairs."""
     data = {}
-    for line in output.split("\n"):
-        if ":" in line:
-            key, value = line.split(":", 1)
-            data[key.strip().lower().replace("-", "_")] = value.strip()
+    key = None
+    for line in output.splitlines():
+        if key is not None and line[:1].isspace():
+            # Indented continuation of the previous value
+            data[key] += "\n" + line.strip()
+        elif ":" in line:
+            # Field names may contain spaces ("Editable project location")
+            name, value = line.split(":", 1)
+            key = name.strip().lower().replace("-", "_")
+            data[key] = value.strip()
     return data
 
 
@@ -357,15 +488,6 @@ def resolve_entry_point(
                 module_path, function_name = entry_target.rsplit(":", 1)
                 return module_path, function_name
 
-    # Case 3: Try common patterns
-    common_patterns = [
-        f"{default_module}:main",
-        f"{default_module}.main:main",
-        f"{default_module}.cli:main",
-        f"{default_module}.server:main",
-        f"{default_module}.__main__:main",
-    ]
-
-    # For now, return the first pattern (could be enhanced to test imports)
-    module_path, function_name = common_patterns[0].split(":")
-    return module_path, function_name
+    # Case 3: Fall back to the package module's main function; other common
+    # layouts (.main, .cli, .server, .__main__) are not probed yet
+    return default_module, default_function
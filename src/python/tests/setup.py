@@ -8,29 +8,36 @@ from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 # Global mock state
 _mcp_caller_mock = None
+_mock_class = None
 _mock_patcher = None
 _is_mock_active = False
 
 
+def _new_caller_mock():
+    """Create a fresh McpCaller mock instance with async methods."""
+    caller_mock = MagicMock()
+    caller_mock.connect = AsyncMock(return_value=None)
+    caller_mock.execute_mcp_call = AsyncMock()
+    caller_mock.close = AsyncMock(return_value=None)
+    return caller_mock
+
+
 def setup_mcp_caller_mock():
     """Set up the McpCaller mock using unittest.mock.patch."""
-    global _mcp_caller_mock, _mock_patcher, _is_mock_active
+    global _mcp_caller_mock, _mock_class, _mock_patcher, _is_mock_active
 
     # Only set up mock if not already active
     if _is_mock_active:
         return _mcp_caller_mock
 
     # Create mock instance
-    _mcp_caller_mock = MagicMock()
-    _mcp_caller_mock.connect = AsyncMock(return_value=None)
-    _mcp_caller_mock.execute_mcp_call = AsyncMock()
-    _mcp_caller_mock.close = AsyncMock(return_value=None)
+    _mcp_caller_mock = _new_caller_mock()
 
     # Create the mock class that returns our mock instance
-    mock_class = Mock(return_value=_mcp_caller_mock)
+    _mock_class = Mock(return_value=_mcp_caller_mock)
 
     # Patch the McpCaller class where it's used
-    _mock_patcher = patch("app.handlers.rpc.McpCaller", mock_class)
+    _mock_patcher = patch("app.handlers.rpc.McpCaller", _mock_class)
     _mock_patcher.start()
     _is_mock_active = True
 
@@ -52,15 +59,13 @@ def activate_mock_if_needed(has_mocks: bool):
 
 def reset_mocks():
     """Reset all mocks - mirrors JavaScript resetMocks function."""
+    global _mcp_caller_mock
+
     if _mcp_caller_mock and _is_mock_active:
-        _mcp_caller_mock.reset_mock()
-        _mcp_caller_mock.connect.reset_mock()
-        _mcp_caller_mock.execute_mcp_call.reset_mock()
-        _mcp_caller_mock.close.reset_mock()
-
-        # Clear any configured behavior
-        _mcp_caller_mock.execute_mcp_call.return_value = None
-        _mcp_caller_mock.execute_mcp_call.side_effect = None
+        # A fresh instance drops recorded calls and configured behavior
+        _mcp_caller_mock = _new_caller_mock()
+        _mock_class.reset_mock()
+        _mock_class.return_value = _mcp_caller_mock
 
 
 def setup_test_environment():
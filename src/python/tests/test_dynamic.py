@@ -4,12 +4,13 @@ This module dynamically generates pytest tests from the test configuration,
 mirroring the JavaScript dynamic test implementation.
 """
 
+import functools
 import json
 import os
 import pytest
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 # Absolute imports from python package
 from app.helpers.tracer import Tracer
@@ -24,11 +25,18 @@ from tests.setup import (
 )
 
 
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a test config file, cached per path and modification time."""
+    return json.loads(Path(path).read_bytes())
+
+
 class DynamicTestRunner:
     """Dynamic test runner that loads test configuration and creates pytest tests."""
 
     def __init__(self):
         self.test_config = self._load_test_config()
+        self.compile_expectations()
         self.original_env = dict(os.environ)
 
     def _load_test_config(self) -> Dict[str, Any]:
@@ -48,8 +56,7 @@ class DynamicTestRunner:
 
         for full_path in possible_paths:
             if full_path.exists():
-                with open(full_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                return _load_config_cached(str(full_path), full_path.stat().st_mtime)
 
         raise FileNotFoundError(
             f"Could not find test config file at any of: {possible_paths}"
@@ -90,8 +97,23 @@ class DynamicTestRunner:
         else:
             return value
 
+    def compile_expectations(self) -> None:
+        """Convert every test case's expected value to matchers once, up front."""
+        for test_case in self.test_config.get("testCases", []):
+            # The parsed config is shared across runners, so skip compiled cases
+            if "expected" in test_case and "_expected_compiled" not in test_case:
+                test_case["_expected_compiled"] = self.to_matcher(test_case["expected"])
+
     def assert_matches(self, actual: Any, expected: Any) -> None:
         """Assert that actual matches expected, handling special matchers."""
+        expected_type = type(expected)
+        # Equal plain scalars need no matcher; strings may be ANYTHING/ANY_DATE
+        if expected_type in self._SCALAR_TYPES and actual == expected:
+            return
+        matcher = self._MATCHERS.get(expected_type, DynamicTestRunner._match_equal)
+        matcher(self, actual, expected)
+
+    def _match_str(self, actual: Any, expected: str) -> None:
         if expected == "ANYTHING":
             return
         elif expected == "ANY_DATE":
@@ -101,47 +123,56 @@ class DynamicTestRunner:
             assert (
                 "-" in actual and ":" in actual
             ), f"Expected date-like string, got {actual}"
-            return
-        elif isinstance(expected, tuple):
-            # Handle tuple type matching (e.g., (int, float) for ANY_NUMBER)
-            assert isinstance(
-                actual, expected
-            ), f"Expected one of {expected}, got {type(actual)}"
-            return
-        elif isinstance(expected, type):
-            assert isinstance(
-                actual, expected
-            ), f"Expected {expected}, got {type(actual)}"
-        elif isinstance(expected, dict):
-            if "__contains" in expected:
-                assert expected["__contains"] in str(
-                    actual
-                ), f"Expected '{expected['__contains']}' in '{actual}'"
-                return
-            elif "__contains_obj" in expected:
-                if isinstance(actual, dict):
-                    self._assert_object_contains(actual, expected["__contains_obj"])
-                return
-            elif "__not_contains_obj" in expected:
-                if isinstance(actual, dict):
-                    self._assert_object_not_contains(
-                        actual, expected["__not_contains_obj"]
-                    )
-                return
-            else:
-                assert isinstance(actual, dict), f"Expected dict, got {type(actual)}"
-                for key, exp_value in expected.items():
-                    assert key in actual, f"Key '{key}' not found in actual result"
-                    self.assert_matches(actual[key], exp_value)
-        elif isinstance(expected, list):
-            assert isinstance(actual, list), f"Expected list, got {type(actual)}"
-            assert len(actual) == len(
-                expected
-            ), f"Expected list length {len(expected)}, got {len(actual)}"
-            for i, (act_item, exp_item) in enumerate(zip(actual, expected)):
-                self.assert_matches(act_item, exp_item)
         else:
-            assert actual == expected, f"Expected {expected}, got {actual}"
+            self._match_equal(actual, expected)
+
+    def _match_type(self, actual: Any, expected: Any) -> None:
+        # Handles single types and tuples of types (e.g., (int, float) for ANY_NUMBER)
+        assert isinstance(actual, expected), (
+            f"Expected one of {expected}, got {type(actual)}"
+            if isinstance(expected, tuple)
+            else f"Expected {expected}, got {type(actual)}"
+        )
+
+    def _match_dict(self, actual: Any, expected: Dict[str, Any]) -> None:
+        if "__contains" in expected:
+            assert expected["__contains"] in str(
+                actual
+            ), f"Expected '{expected['__contains']}' in '{actual}'"
+        elif "__contains_obj" in expected:
+            if isinstance(actual, dict):
+                self._assert_object_contains(actual, expected["__contains_obj"])
+        elif "__not_contains_obj" in expected:
+            if isinstance(actual, dict):
+                self._assert_object_not_contains(actual, expected["__not_contains_obj"])
+        else:
+            assert isinstance(actual, dict), f"Expected dict, got {type(actual)}"
+            for key, exp_value in expected.items():
+                assert key in actual, f"Key '{key}' not found in actual result"
+                self.assert_matches(actual[key], exp_value)
+
+    def _match_list(self, actual: Any, expected: List[Any]) -> None:
+        assert isinstance(actual, list), f"Expected list, got {type(actual)}"
+        assert len(actual) == len(
+            expected
+        ), f"Expected list length {len(expected)}, got {len(actual)}"
+        for act_item, exp_item in zip(actual, expected):
+            self.assert_matches(act_item, exp_item)
+
+    def _match_equal(self, actual: Any, expected: Any) -> None:
+        assert actual == expected, f"Expected {expected}, got {actual}"
+
+    # Expected types that always compare with plain equality
+    _SCALAR_TYPES = frozenset((int, float, bool, type(None)))
+
+    # assert_matches handlers keyed on the expected value's type
+    _MATCHERS = {
+        str: _match_str,
+        type: _match_type,
+        tuple: _match_type,
+        dict: _match_dict,
+        list: _match_list,
+    }
 
     def _assert_object_contains(
         self, actual: Dict[str, Any], expected: Dict[str, Any]
@@ -220,16 +251,15 @@ class DynamicTestRunner:
 
     def restore_env(self) -> None:
         """Restore original environment variables."""
-        # Store current keys to avoid KeyError during cleanup
-        current_keys = list(os.environ.keys())
-
-        # Remove all current environment variables
-        for key in current_keys:
-            if key in os.environ:
-                del os.environ[key]
+        environ = os.environ
+        original_env = self.original_env
 
-        # Restore original environment variables
-        os.environ.update(self.original_env)
+        # Only touch variables that were added or changed since startup
+        for key in environ.keys() - original_env.keys():
+            del environ[key]
+        for key, value in original_env.items():
+            if environ.get(key) != value:
+                environ[key] = value
 
     async def run_test_case(self, test_case: Dict[str, Any]) -> None:
         """Run a single test case."""
@@ -240,7 +270,9 @@ class DynamicTestRunner:
             result = await self.execute_test(test_case["input"])
 
             if "expected" in test_case:
-                expected = self.to_matcher(test_case["expected"])
+                expected = test_case.get("_expected_compiled")
+                if expected is None:
+                    expected = self.to_matcher(test_case["expected"])
                 self.assert_matches(result, expected)
 
         except Exception:
@@ -0,0 +1,221 @@
+"""Pipe-level tests for the McpCaller transport.
+
+The server mains below are run by SimpleThreadedMcpServer with the real stdin
+and stdout pipes, so these tests exercise the actual request framing, the
+non-blocking writes and the response matching.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+from app.helpers.error import CustomError
+from app.helpers.mcp_caller import McpCaller
+from app.helpers.schema import McpCallerConfiguration
+
+# Larger than the default 64 KiB pipe buffer in both directions
+_REQUEST_PAD = "x" * 50_000
+_RESPONSE_PAD = "y" * 200_000
+
+
+def _respond(stdout, message):
+    stdout.write(json.dumps(message) + "\n")
+    stdout.flush()
+
+
+def sequential_main():
+    """Answer one request at a time, writing large responses."""
+    stdin, stdout = sys.stdin, sys.stdout
+    for line in stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+        if message["method"] == "initialize":
+            result = {"serverInfo": {"name": "sequential"}}
+        else:
+            result = {"echo": message["params"]["n"], "pad": _RESPONSE_PAD}
+        _respond(stdout, {"jsonrpc": "2.0", "id": message["id"], "result": result})
+
+
+def _echo_response(message):
+    result = {"echo": message["params"].get("n")}
+    return {"jsonrpc": "2.0", "id": message["id"], "result": result}
+
+
+async def blocking_amain():
+    """Async main that reads stdin synchronously, blocking its event loop."""
+    stdin, stdout = sys.stdin, sys.stdout
+    for line in stdin:
+        message = json.loads(line)
+        if "id" in message:
+            _respond(stdout, _echo_response(message))
+
+
+async def cooperative_amain():
+    """Async main that waits for stdin off the event loop."""
+    stdin, stdout = sys.stdin, sys.stdout
+    while line := await asyncio.to_thread(stdin.readline):
+        message = json.loads(line)
+        if "id" in message:
+            _respond(stdout, _echo_response(message))
+
+
+def scripted_main():
+    """Answer requests as their method says, to drive the transport edge cases.
+
+    "later" requests are held until a "flush", which answers them in reverse
+    order with each response split across two writes; "fail_all" sends an
+    error without an id and "hangup" closes stdout without answering.
+    """
+    stdin, stdout = sys.stdin, sys.stdout
+    held = []
+    for line in stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+        method = message["method"]
+        if method == "initialize":
+            _respond(stdout, {"jsonrpc": "2.0", "id": message["id"], "result": {}})
+        elif method == "echo":
+            result = {"echo": message["params"]["n"]}
+            _respond(stdout, {"jsonrpc": "2.0", "id": message["id"], "result": result})
+        elif method == "later":
+            held.append(message)
+        elif method == "flush":
+            for request in [*reversed(held), message]:
+                frame = json.dumps(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": request["id"],
+                        "result": {"echo": request["params"]["n"]},
+                    }
+                )
+                half = len(frame) // 2
+                stdout.write(frame[:half])
+                stdout.flush()
+                time.sleep(0.01)
+                stdout.write(frame[half:] + "\n")
+                stdout.flush()
+            held.clear()
+        elif method == "fail_all":
+            error = {"code": -32603, "message": "server exploded"}
+            _respond(stdout, {"jsonrpc": "2.0", "error": error})
+        elif method == "hangup":
+            stdout.close()
+            return
+
+
+def _run(coro, timeout: float = 20.0):
+    """Run a coroutine on its own loop thread so a hang fails instead of blocking."""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = asyncio.run(coro)
+        except BaseException as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), f"transport did not finish within {timeout}s"
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def _caller(function_name: str) -> McpCaller:
+    return McpCaller(
+        McpCallerConfiguration(
+            module_path=__name__,
+            package_name="tests",
+            function_name=function_name,
+        )
+    )
+
+
+def _call(n: int, method: str = "echo", **extra):
+    return {"jsonrpc": "2.0", "method": method, "params": {"n": n, **extra}}
+
+
+async def _batch(function_name: str, requests):
+    caller = _caller(function_name)
+    await caller.connect()
+    try:
+        return await caller.execute_many(requests)
+    finally:
+        await caller.close()
+
+
+def test_batch_larger_than_pipe_buffers():
+    requests = [_call(n, pad=_REQUEST_PAD) for n in range(5)]
+
+    results = _run(_batch("sequential_main", requests))
+
+    assert [result["echo"] for result in results] == list(range(5))
+    assert all(len(result["pad"]) == len(_RESPONSE_PAD) for result in results)
+
+
+def test_responses_matched_by_id_in_request_order():
+    requests = [
+        _call(0, "later"),
+        _call(1, "later"),
+        _call(2, "echo"),
+        _call(3, "flush"),
+    ]
+
+    results = _run(_batch("scripted_main", requests))
+
+    assert [result["echo"] for result in results] == [0, 1, 2, 3]
+
+
+def test_idless_error_fails_every_pending_request():
+    requests = [_call(0, "later"), _call(1, "fail_all")]
+
+    with pytest.raises(CustomError, match="server exploded"):
+        _run(_batch("scripted_main", requests))
+
+
+def test_eof_fails_pending_requests():
+    requests = [_call(0, "later"), _call(1, "hangup")]
+
+    with pytest.raises(RuntimeError, match="No response from MCP server"):
+        _run(_batch("scripted_main", requests))
+
+
+@pytest.mark.parametrize("ids", [[7, 7], [None]])
+def test_duplicate_or_null_ids_are_rejected(ids):
+    requests = [{**_call(n), "id": request_id} for n, request_id in enumerate(ids)]
+
+    with pytest.raises(CustomError, match="Invalid or duplicate request id"):
+        _run(_batch("scripted_main", requests))
+
+
+def test_assigned_ids_skip_ids_used_in_batch():
+    requests = [{**_call(0), "id": 2}, _call(1), _call(2)]
+
+    results = _run(_batch("scripted_main", requests))
+
+    assert [result["echo"] for result in results] == [0, 1, 2]
+    assert len({request["id"] for request in requests}) == 3
+
+
+def test_blocked_runtime_does_not_stall_later_async_servers():
+    async def scenario():
+        blocking = _caller("blocking_amain")
+        await blocking.connect()
+        try:
+            cooperative = _caller("cooperative_amain")
+            await cooperative.connect()
+            try:
+                return await cooperative.execute_many([_call(1)])
+            finally:
+                await cooperative.close()
+        finally:
+            await blocking.close()
+
+    assert _run(scenario())[0]["echo"] == 1
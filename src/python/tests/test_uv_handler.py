@@ -0,0 +1,122 @@
+"""Tests for uvx-style server argument parsing in the uv handler."""
+
+import subprocess
+
+import pytest
+
+from app.helpers import uv_handler
+
+
+@pytest.fixture
+def uv_commands(monkeypatch, tmp_path):
+    """Record uv subprocess calls instead of running them."""
+    commands = []
+
+    def fake_run(cmd, **kwargs):
+        commands.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(uv_handler.subprocess, "run", fake_run)
+    monkeypatch.setattr(uv_handler, "_is_package_installed", lambda name: False)
+    monkeypatch.setattr(uv_handler, "_invalidate_dist_cache", lambda: None)
+    return commands
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["pkg"],
+        ["--quiet", "pkg"],
+        ["--index", "https://idx", "pkg"],
+        ["--default-index", "https://idx", "pkg"],
+        ["--cache-dir", "/c", "pkg"],
+        ["-f", "/wheels", "--find-links", "/more", "pkg"],
+        ["--index-strategy", "unsafe-best-match", "pkg"],
+        ["-c", "constraints.txt", "--exclude-newer", "2024-01-01", "pkg"],
+        ["--prerelease", "allow", "--resolution", "lowest", "pkg"],
+        ["--refresh-package", "dep", "--upgrade-package", "dep", "pkg"],
+        ["--keyring-provider", "subprocess", "--no-cache", "pkg"],
+        ["--python", "3.12", "--with", "dep", "pkg", "extra-arg"],
+        ["--unknown-opt", "val", "pkg"],
+        ["--unknown-opt=val", "pkg"],
+        ["-qq", "--unknown-opt", "--verbose", "pkg"],
+    ],
+)
+def test_value_options_are_not_taken_as_package(uv_commands, args):
+    result = uv_handler.parse_mcp_server_params(args, refresh=True)
+
+    assert result["package_name"] == "pkg"
+    install_cmd = uv_commands[0]
+    assert install_cmd[:3] == ["uv", "pip", "install"]
+    assert "pkg" in install_cmd
+    assert not {"https", "/c", "val"} & set(install_cmd)
+
+
+def test_value_of_unrecognised_option_is_not_installed(uv_commands):
+    with pytest.raises(ValueError, match="unrecognised option --unknown-opt"):
+        uv_handler.parse_mcp_server_params(["--unknown-opt", "val"], refresh=True)
+
+    assert uv_commands == []
+
+
+def test_entry_point_and_index_urls(uv_commands):
+    result = uv_handler.parse_mcp_server_params(
+        [
+            "--index-url",
+            "https://primary",
+            "--extra-index-url",
+            "https://extra",
+            "--from",
+            "git+https://example.com/pkg.git",
+            "pkg:serve",
+        ],
+        refresh=True,
+    )
+
+    assert result["package_name"] == "pkg"
+    assert result["module_path"] == "pkg"
+    assert result["function_name"] == "serve"
+    assert uv_commands[0][-1] == "git+https://example.com/pkg.git"
+    assert "https://primary" in uv_commands[0]
+    assert "https://extra" in uv_commands[0]
+
+
+def test_parse_uv_show_output_editable_install():
+    output = (
+        "Name: my-server\n"
+        "Version: 0.1.0\n"
+        "Location: /cache/lib/python3.11/site-packages\n"
+        "Editable project location: /src/my-server\n"
+        "Requires: httpx, mcp\n"
+        "Required-by:\n"
+        "Summary: A server\n"
+        "  spanning two lines\n"
+    )
+
+    data = uv_handler.parse_uv_show_output(output)
+
+    assert data["name"] == "my-server"
+    assert data["editable project location"] == "/src/my-server"
+    assert data["requires"] == "httpx, mcp"
+    assert data["required_by"] == ""
+    assert data["summary"] == "A server\nspanning two lines"
+
+
+def test_cached_result_is_copied_and_revalidated(uv_commands, monkeypatch):
+    first = uv_handler.parse_mcp_server_params(["json"], refresh=True)
+    resolved_commands = len(uv_commands)
+    first["with_deps"].append("leaked")
+    first["inspection_data"]["leaked"] = "yes"
+
+    second = uv_handler.parse_mcp_server_params(["json"])
+
+    assert second["with_deps"] == []
+    assert "leaked" not in second["inspection_data"]
+    assert len(uv_commands) == resolved_commands
+
+    # An entry module that can no longer be found is resolved again
+    monkeypatch.setattr(uv_handler, "_module_available", lambda module_path: False)
+    uv_handler.parse_mcp_server_params(["json"])
+
+    assert len(uv_commands) > resolved_commands